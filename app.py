@@ -1,24 +1,193 @@
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, g, request, jsonify, render_template, send_from_directory
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.exceptions import NotFound
 import json
-import random
 import os
 import datetime
 import shutil
-import calendar
+import sys
+import functools
+import threading
+from collections import defaultdict
+from operator import itemgetter
+import mmap
 import pandas as pd
-from dataclasses import dataclass
-from typing import Dict, List, Optional
+import numpy as np
+from typing import Dict, List, Optional, Tuple
 import logging
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library encoder
+    orjson = None
+
+# Month lengths for a common year; February is adjusted for leap years in _days_in_month
+_DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+def _days_in_month(year: int, month: int) -> int:
+    if month == 2 and year % 4 == 0 and (year % 100 != 0 or year % 400 == 0):
+        return 29
+    return _DAYS_IN_MONTH[month - 1]
+
+# ==========================
+# JSON Helpers: Fast encode/decode with orjson when available
+# ==========================
+
+def json_loads(data):
+    """Parse JSON from str or bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def json_dumps_bytes(obj, indent: bool = True) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes, indented by 2 spaces unless indent is False."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None).encode("utf-8")
+
+# Below this size a single read() beats the mmap/madvise/munmap setup cost
+_MMAP_MIN_SIZE = 1 << 20
+
+def read_json_file(path: str):
+    """
+    Read and parse a JSON file. Files of 1 MiB or more are memory-mapped and
+    parsed by orjson straight from the page cache; smaller files use one read.
+    """
+    with open(path, "rb") as f:
+        if orjson is None or os.fstat(f.fileno()).st_size < _MMAP_MIN_SIZE:
+            return json_loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+
+@functools.lru_cache(maxsize=64)
+def _read_json_snapshot(path: str, mtime_ns: int, size: int):
+    return read_json_file(path)
+
+def read_json_cached(path: str):
+    """
+    Parse a JSON file, reusing the last result while its mtime and size are unchanged.
+    Raises FileNotFoundError if the file is missing. Callers must not mutate the result.
+    """
+    st = os.stat(path)
+    return _read_json_snapshot(path, st.st_mtime_ns, st.st_size)
+
+def write_json_file(path: str, obj, indent: bool = True):
+    """
+    Write obj to path atomically: the bytes go to a temporary file in the same
+    directory, are fsynced, then renamed over path, so readers never see a partial file.
+    """
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(json_dumps_bytes(obj, indent))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+# ==========================
+# Monthly Detail Log: Append-only JSON Lines, one record per meter-day
+# ==========================
+
+def iter_monthly_detail(path: str):
+    """
+    Yield (meter_id, {"date", "readings"}) pairs from a monthly detail file.
+    A missing .jsonl log falls back to its legacy .json snapshot; FileNotFoundError
+    is raised if neither exists. A last line without its newline is an append
+    still being written and is skipped.
+    """
+    if path.endswith(".jsonl"):
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError:
+            path = path[:-1]
+        else:
+            with f:
+                for line in f:
+                    if line.endswith(b"\n") and line.strip():
+                        record = json_loads(line)
+                        yield record["meter_ID"], {"date": record["date"], "readings": record["readings"]}
+            return
+    for meter_id, days in read_json_file(path).items():
+        for day_data in days:
+            yield meter_id, day_data
+
+def summarize_monthly_detail(path: str) -> Dict[str, Dict[str, Tuple[float, float, int]]]:
+    """
+    Reduce a monthly detail file to {meter_id: {date: (first value, last value, reading count)}}.
+    Days keep log order; if a date repeats, its first record wins.
+    """
+    totals = {}
+    for meter_id, day_data in iter_monthly_detail(path):
+        readings = day_data["readings"]
+        if readings:
+            totals.setdefault(meter_id, {}).setdefault(
+                day_data["date"], (readings[0]["value"], readings[-1]["value"], len(readings))
+            )
+    return totals
+
+@functools.lru_cache(maxsize=32)
+def _daily_totals_snapshot(path: str, mtime_ns: int, size: int) -> Dict[str, Dict[str, Tuple[float, float, int]]]:
+    return summarize_monthly_detail(path)
+
+def read_daily_totals_cached(path: str) -> Dict[str, Dict[str, Tuple[float, float, int]]]:
+    """
+    summarize_monthly_detail, reusing the last result while the file's mtime and size
+    are unchanged; every append moves both. Callers must not mutate the result.
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        if not path.endswith(".jsonl"):
+            raise
+        try:
+            st = os.stat(path[:-1])
+            return _daily_totals_snapshot(path[:-1], st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            # A concurrent collect migrated the legacy snapshot into the log
+            st = os.stat(path)
+    return _daily_totals_snapshot(path, st.st_mtime_ns, st.st_size)
+
+def append_monthly_detail(path: str, day_data: Dict[str, dict]):
+    """
+    Append one line per meter-day to the monthly detail log.
+    A legacy .json snapshot for the same month is carried over on first append.
+    """
+    records = []
+    legacy_path = path[:-1]
+    # Legacy snapshots are rare, so probe for them first and stat the log only if one exists
+    migrate = os.path.exists(legacy_path) and not os.path.exists(path)
+    if migrate:
+        for meter_id, days in read_json_file(legacy_path).items():
+            records.extend({"meter_ID": meter_id, **day} for day in days)
+    records.extend({"meter_ID": meter_id, **day} for meter_id, day in day_data.items())
+    with open(path, "ab") as f:
+        f.write(b"".join(json_dumps_bytes(record, indent=False) + b"\n" for record in records))
+    if migrate:
+        os.remove(legacy_path)
 
 # ==========================
 # Data Structure Definition
 # ==========================
 
-@dataclass
-class MeterReading:
-    meter_id: str
-    reading_time: str
-    meter_value: float
+def new_reading_cache() -> dict:
+    """
+    Columnar (struct-of-arrays) store for one day's cached readings: one list per
+    field, index i across all lists describes a single reading. Values are integer
+    thousandths of a unit (e.g. 1234.567 is stored as 1234567). The day itself is
+    the bucket's key in the cache; "last_dt" holds the latest reading time in it.
+    """
+    return {"meter_id": [], "time_str": [], "value": [], "last_dt": None}
 
 # ==========================
 # Directory Manager: Handles folder and path management
@@ -32,16 +201,34 @@ class DirectoryManager:
         self.monthly_readings_dir = os.path.join(self.data_dir, "month_readings")
         self.accounts_file = os.path.join(self.data_dir, "all_account.json")
         self.current_time_file = os.path.join(self.data_dir, "current_time.json")
+        self._made_dirs: set = set()
+        # (base, year, month) -> created month directory path
+        self._month_dirs: Dict[Tuple[str, int, int], str] = {}
         self.ensure_directories()
 
+    def _makedirs(self, path: str):
+        # Only touch the filesystem the first time a directory is requested
+        if path not in self._made_dirs:
+            os.makedirs(path, exist_ok=True)
+            self._made_dirs.add(path)
+
+    def forget_directories(self):
+        """Drop the record of created directories after folders are deleted."""
+        self._made_dirs.clear()
+        self._month_dirs.clear()
+
     def ensure_directories(self):
-        os.makedirs(self.data_dir, exist_ok=True)
-        os.makedirs(self.daily_readings_dir, exist_ok=True)
-        os.makedirs(self.monthly_readings_dir, exist_ok=True)
+        self._makedirs(self.data_dir)
+        self._makedirs(self.daily_readings_dir)
+        self._makedirs(self.monthly_readings_dir)
 
     def get_month_directory(self, base: str, date: datetime.datetime) -> str:
-        month_dir = os.path.join(base, date.strftime("%Y%m"))
-        os.makedirs(month_dir, exist_ok=True)
+        key = (base, date.year, date.month)
+        month_dir = self._month_dirs.get(key)
+        if month_dir is None:
+            month_dir = os.path.join(base, f"{date.year:04d}{date.month:02d}")
+            self._makedirs(month_dir)
+            self._month_dirs[key] = month_dir
         return month_dir
 
 # ==========================
@@ -51,25 +238,56 @@ class DirectoryManager:
 class AccountManager:
     def __init__(self, accounts_file: str):
         self.accounts_file = accounts_file
+        # In-memory registry: the account list plus a set of meter IDs for O(1) lookups
+        self._load()
+
+    def _file_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.accounts_file).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _load(self):
+        # Stat before reading so a write that lands mid-read triggers another reload
+        self._mtime_ns = self._file_mtime()
+        self._accounts: List[dict] = self._read_accounts()
+        self._ids: set = {acc["meter_ID"] for acc in self._accounts}
+
+    def _refresh(self):
+        """Reload the registry if the accounts file was changed outside this manager."""
+        if self._file_mtime() != self._mtime_ns:
+            self._load()
+
+    def _read_accounts(self) -> List[dict]:
+        try:
+            accounts = read_json_file(self.accounts_file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return []
+        if not isinstance(accounts, list):
+            return []
+        # Meter IDs key every cache and file; interning lets dict lookups match on identity
+        for account in accounts:
+            account["meter_ID"] = sys.intern(account["meter_ID"])
+        return accounts
 
     def load_accounts(self) -> List[dict]:
-        if os.path.exists(self.accounts_file):
-            with open(self.accounts_file, "r", encoding="utf-8") as f:
-                try:
-                    accounts = json.load(f)
-                    return accounts if isinstance(accounts, list) else []
-                except json.JSONDecodeError:
-                    return []
-        return []
+        self._refresh()
+        return self._accounts
+
+    def has_account(self, meter_id: str) -> bool:
+        self._refresh()
+        return meter_id in self._ids
 
     def save_accounts(self, accounts: List[dict]):
-        os.makedirs(os.path.dirname(self.accounts_file), exist_ok=True)
-        with open(self.accounts_file, "w", encoding="utf-8") as f:
-            json.dump(accounts, f, ensure_ascii=False, indent=2)
+        write_json_file(self.accounts_file, accounts)
+        self._accounts = list(accounts)
+        self._ids = {acc["meter_ID"] for acc in self._accounts}
+        self._mtime_ns = self._file_mtime()
 
     def register_account(self, meter_id: str, area: str, dwelling: str, register_time: str) -> dict:
-        accounts = self.load_accounts()
-        if any(acc["meter_ID"] == meter_id for acc in accounts):
+        self._refresh()
+        meter_id = sys.intern(meter_id)
+        if meter_id in self._ids:
             raise ValueError("Meter ID already exists")
         account = {
             "meter_ID": meter_id,
@@ -77,8 +295,10 @@ class AccountManager:
             "dwelling": dwelling,
             "register_time": register_time
         }
-        accounts.append(account)
-        self.save_accounts(accounts)
+        self._accounts.append(account)
+        self._ids.add(meter_id)
+        write_json_file(self.accounts_file, self._accounts)
+        self._mtime_ns = self._file_mtime()
         return account
 
 # ==========================
@@ -88,31 +308,56 @@ class AccountManager:
 class TimeManager:
     def __init__(self, current_time_file: str):
         self.current_time_file = current_time_file
+        # (file mtime_ns, parsed simulation time); re-read only when the file changes
+        self._cached: Optional[Tuple[int, datetime.datetime]] = None
+
+    def _file_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.current_time_file).st_mtime_ns
+        except FileNotFoundError:
+            return None
 
     def get_current_time(self) -> datetime.datetime:
-        if os.path.exists(self.current_time_file):
-            with open(self.current_time_file, "r") as f:
-                data = json.load(f)
-                return datetime.datetime.fromisoformat(data["current_time"])
-        else:
+        mtime_ns = self._file_mtime()
+        if self._cached is not None and self._cached[0] == mtime_ns:
+            return self._cached[1]
+        try:
+            data = read_json_file(self.current_time_file)
+        except FileNotFoundError:
             initial_time = datetime.datetime(2024, 5, 1)
             self.save_current_time(initial_time)
             return initial_time
+        current_time = datetime.datetime.fromisoformat(data["current_time"])
+        self._cached = (mtime_ns, current_time)
+        return current_time
 
     def save_current_time(self, current_time: datetime.datetime):
-        with open(self.current_time_file, "w") as f:
-            json.dump({"current_time": current_time.isoformat()}, f)
+        write_json_file(self.current_time_file, {"current_time": current_time.isoformat()}, indent=False)
+        self._cached = (self._file_mtime(), current_time)
 
 # ==========================
 # Reading Generator: Generates meter readings and maintains latest readings and daily cache
 # ==========================
 
 class ReadingGenerator:
+    # Windows with at least this many (slot, meter) cells are drawn on a thread pool
+    PARALLEL_MIN_CELLS = 1_000_000
+
     def __init__(self, time_manager: TimeManager, account_manager: AccountManager):
         self.time_manager = time_manager
         self.account_manager = account_manager
-        self.latest_readings: Dict[str, float] = {}
-        self.daily_cache: List[MeterReading] = []
+        self._rng = np.random.default_rng()
+        # Latest value per meter, in integer thousandths of a unit
+        self.latest_readings: Dict[str, int] = {}
+        # Cached readings grouped by day: date string -> columnar bucket (see new_reading_cache)
+        self.daily_cache: Dict[str, dict] = {}
+
+    def day_bucket(self, date_str: str) -> dict:
+        """Return the cache bucket for a day, creating it on first use."""
+        bucket = self.daily_cache.get(date_str)
+        if bucket is None:
+            bucket = self.daily_cache[date_str] = new_reading_cache()
+        return bucket
 
     def _calculate_next_time(
         self, current_time: datetime.datetime, increment_unit: str, increment_value: int
@@ -127,93 +372,120 @@ class ReadingGenerator:
             next_month = current_time.month + increment_value
             next_year = current_time.year + (next_month - 1) // 12
             next_month = ((next_month - 1) % 12) + 1
-            last_day_of_next_month = calendar.monthrange(next_year, next_month)[1]
+            last_day_of_next_month = _days_in_month(next_year, next_month)
             next_day = min(current_time.day, last_day_of_next_month)
             return current_time.replace(year=next_year, month=next_month, day=next_day)
         else:
             raise ValueError("Invalid time unit")
 
-    def generate_readings_for_day(
-        self, day_start: datetime.datetime, day_end: datetime.datetime
-    ) -> List[dict]:
+    def _slot_times(
+        self, start_time: datetime.datetime, end_time: datetime.datetime
+    ) -> pd.DatetimeIndex:
         """
-        Generate data within the same day:
-        - If start time is at midnight, skip 0:00-1:00 (maintenance period)
-        - Generate a data point every 30 minutes until reaching day_end
+        Reading time points in the collection window:
+        - Every 30 minutes, counted from the start of start_time's hour, up to and including end_time
+        - Nothing is stamped from 0:00 to 1:00 (maintenance period)
         """
-        accounts = self.account_manager.load_accounts()
-        daily_readings = []
-        # Normalize start time: if in maintenance period, start from 1:00
-        current = day_start.replace(minute=0, second=0, microsecond=0)
-        if current.hour == 0:
-            current = current.replace(hour=1)
-        
-        while current < day_end:
-            next_time = current + datetime.timedelta(minutes=30)
-            # Exit if next time point exceeds end time
-            if next_time > day_end:
-                break
-            # End generation for the day if next time point enters maintenance period
-            if next_time.hour == 0:
-                break
-
-            for account in accounts:
-                meter_id = account["meter_ID"]
-                previous_value = self.latest_readings.get(meter_id, 0)
-                increment = random.uniform(0, 1)
-                meter_value = previous_value + increment
-                self.latest_readings[meter_id] = meter_value
-
-                reading = {
-                    "meter_ID": meter_id,
-                    "reading_time": next_time.isoformat(),
-                    "meter_value": round(meter_value, 3)
-                }
-                daily_readings.append(reading)
-                self.daily_cache.append(MeterReading(meter_id, next_time.isoformat(), round(meter_value, 3)))
-            
-            current = next_time
+        first_slot = pd.Timestamp(start_time).floor("h") + pd.Timedelta(minutes=30)
+        slots = pd.date_range(first_slot, end_time, freq="30min")
+        in_maintenance = (slots.hour == 0) | ((slots.hour == 1) & (slots.minute == 0))
+        return slots[~in_maintenance]
+
+    @staticmethod
+    def _pooled_strftime(slot_index: pd.DatetimeIndex, keys, fmt: str) -> List[str]:
+        """
+        Format slot_index with fmt, formatting each distinct key only once and
+        sharing the resulting (interned) string object across all slots with that key.
+        """
+        _, first, inverse = np.unique(np.asarray(keys), return_index=True, return_inverse=True)
+        pool = np.array([sys.intern(text) for text in slot_index[first].strftime(fmt)], dtype=object)
+        return pool[inverse].tolist()
+
+    def _cumulative_increments(self, n_slots: int, n_meters: int) -> np.ndarray:
+        """
+        Running totals of random increments (thousandths, 0-999 per slot) for each meter.
+        Large windows are split into blocks that are drawn and summed on a thread pool
+        (NumPy releases the GIL in both steps), then each block is offset by the
+        running total carried over from the blocks before it.
+        """
+        n_blocks = min(os.cpu_count() or 1, n_slots)
+        if n_slots * n_meters < self.PARALLEL_MIN_CELLS or n_blocks < 2:
+            increments = (self._rng.random((n_slots, n_meters)) * 1000).astype(np.int32)
+            return increments.cumsum(axis=0, dtype=np.int64)
+
+        block_sizes = [len(b) for b in np.array_split(np.arange(n_slots), n_blocks)]
+        seeds = self._rng.integers(2**63, size=n_blocks)
 
-        return daily_readings
+        def draw_block(i):
+            rng = np.random.default_rng(seeds[i])
+            increments = (rng.random((block_sizes[i], n_meters)) * 1000).astype(np.int32)
+            return increments.cumsum(axis=0, dtype=np.int64)
+
+        with ThreadPoolExecutor(max_workers=n_blocks) as executor:
+            blocks = list(executor.map(draw_block, range(n_blocks)))
+        for previous, block in zip(blocks, blocks[1:]):
+            block += previous[-1]
+        return np.concatenate(blocks)
 
     def generate_readings(
-        self, start_time: datetime.datetime, end_time: datetime.datetime
-    ) -> List[dict]:
+        self, start_time: datetime.datetime, end_time: datetime.datetime,
+        accounts: List[dict], sample_size: int = 3
+    ) -> Tuple[int, List[dict]]:
         """
-        Generate data based on start and end times. If spanning multiple days,
-        iterate through each day calling generate_readings_for_day.
+        Generate data for every reading time point between start and end times,
+        across any number of days, in a single vectorized pass.
+        Readings go straight into daily_cache; only the count and the first
+        sample_size readings are returned as dicts.
         """
-        readings = []
-        # If within the same day, generate data directly
-        if start_time.date() == end_time.date():
-            return self.generate_readings_for_day(start_time, end_time)
-        
-        # Process first day
-        first_day_end = datetime.datetime.combine(start_time.date(), datetime.time(23, 59, 59))
-        readings.extend(self.generate_readings_for_day(start_time, first_day_end))
-
-        # Process middle days
-        next_day = start_time.date() + datetime.timedelta(days=1)
-        while next_day < end_time.date():
-            day_start = datetime.datetime.combine(next_day, datetime.time(0, 0))
-            day_end = datetime.datetime.combine(next_day, datetime.time(23, 59, 59))
-            readings.extend(self.generate_readings_for_day(day_start, day_end))
-            next_day += datetime.timedelta(days=1)
-
-        # Process last day
-        last_day_start = datetime.datetime.combine(end_time.date(), datetime.time(0, 0))
-        readings.extend(self.generate_readings_for_day(last_day_start, end_time))
-        return readings
+        if not accounts:
+            return 0, []
+        slot_index = self._slot_times(start_time, end_time)
+        if len(slot_index) == 0:
+            return 0, []
+
+        slot_times = slot_index.to_pydatetime().tolist()
+        # At most 48 HH:MM strings exist; share them across days and meters
+        slot_hms = self._pooled_strftime(slot_index, slot_index.hour * 60 + slot_index.minute, "%H:%M")
+
+        # Draw all increments at once (in thousandths) and accumulate them per meter
+        meter_ids = [account["meter_ID"] for account in accounts]
+        base = np.array([self.latest_readings.get(meter_id, 0) for meter_id in meter_ids], dtype=np.int64)
+        values = self._cumulative_increments(len(slot_times), len(meter_ids))
+        values += base
+        self.latest_readings.update(zip(meter_ids, values[-1].tolist()))
+
+        count = values.size
+        sample = []
+        for i in range(min(sample_size, count)):
+            slot, meter = divmod(i, len(meter_ids))
+            sample.append({
+                "meter_ID": meter_ids[meter],
+                "reading_time": slot_times[slot].isoformat(),
+                "meter_value": values[slot, meter].item() / 1000.0
+            })
+        # Append to each day's bucket column by column, in the same (slot, meter) order
+        days = slot_index.normalize()
+        day_breaks = (np.flatnonzero(days[1:] != days[:-1]) + 1).tolist()
+        for start, end in zip([0] + day_breaks, day_breaks + [len(slot_times)]):
+            bucket = self.day_bucket(slot_index[start].strftime("%Y-%m-%d"))
+            bucket["meter_id"].extend(meter_ids * (end - start))
+            bucket["last_dt"] = slot_times[end - 1]
+            bucket["time_str"].extend(t for t in slot_hms[start:end] for _ in meter_ids)
+            bucket["value"].extend(values[start:end].ravel().tolist())
+        return count, sample
 
     def collect(self, increment_unit: str, increment_value: int) -> dict:
         current_time = self.time_manager.get_current_time()
         next_time = self._calculate_next_time(current_time, increment_unit, increment_value)
-        readings = self.generate_readings(current_time, next_time)
-        self.time_manager.save_current_time(next_time)
+        accounts = self.account_manager.load_accounts()
+        readings_count, sample_readings = self.generate_readings(current_time, next_time, accounts)
+        # A zero-length step leaves the clock where it is; skip the rewrite
+        if next_time != current_time:
+            self.time_manager.save_current_time(next_time)
         return {
             "message": f"Readings collected from {current_time} to {next_time}",
-            "readings_count": len(readings),
-            "sample_readings": readings[:3] if readings else [],
+            "readings_count": readings_count,
+            "sample_readings": sample_readings,
             "new_time": next_time.isoformat()
         }
 
@@ -224,84 +496,148 @@ class ReadingGenerator:
 class DailyProcessor:
     def __init__(self, directory_manager: DirectoryManager):
         self.directory_manager = directory_manager
-
-    def process(self, daily_cache: List[MeterReading], process_date: datetime.datetime):
-        if not daily_cache:
+        # The latest day's readings, kept in memory until a later day arrives:
+        # (date, date_str, daily_data, whether readings_YYYYMMDD.json holds them)
+        self._open_day: Optional[Tuple[datetime.datetime, str, Dict[str, dict], bool]] = None
+
+    def process(
+        self, daily_cache: dict, process_date: datetime.datetime,
+        date_str: Optional[str] = None, write: bool = True
+    ):
+        """
+        Merge one day's cached readings into the open day. A new day first moves
+        the previous open day into its month's detail log. With write=False the
+        daily file is left for a later call, which avoids writing a file that the
+        next day of the same collect would immediately read back and delete.
+        """
+        if not daily_cache["meter_id"]:
             return
 
-        daily_data = {}
-        for reading in daily_cache:
-            meter_id = reading.meter_id
-            if meter_id not in daily_data:
-                daily_data[meter_id] = {
-                    "date": process_date.strftime("%Y-%m-%d"),
-                    "readings": []
-                }
-            time_part = datetime.datetime.fromisoformat(reading.reading_time).strftime("%H:%M")
-            daily_data[meter_id]["readings"].append({
-                "time": time_part,
-                "value": round(reading.meter_value, 3)
-            })
+        if date_str is None:
+            date_str = process_date.strftime("%Y-%m-%d")
+        # Single pass over the columns; slot order within each meter is preserved
+        readings_by_meter = defaultdict(list)
+        for meter_id, time_str, value in zip(
+            daily_cache["meter_id"], daily_cache["time_str"], daily_cache["value"]
+        ):
+            readings_by_meter[meter_id].append({"time": time_str, "value": value / 1000})
+        daily_data = {
+            meter_id: {"date": date_str, "readings": readings}
+            for meter_id, readings in readings_by_meter.items()
+        }
 
-        yesterday = process_date - datetime.timedelta(days=1)
-        yesterday_file = self.get_daily_file_path(yesterday)
-        yesterday_month_dir = self.directory_manager.get_month_directory(
-            self.directory_manager.daily_readings_dir, yesterday
+        open_day = self._open_day
+        if open_day is None:
+            open_day, _ = self._recover_open_day(process_date, date_str)
+        written = False
+        if open_day is not None and open_day[1] == date_str:
+            # Same day as the open one: extend it instead of overwriting its file
+            open_data = open_day[2]
+            for meter_id, day_data in daily_data.items():
+                if meter_id in open_data:
+                    open_data[meter_id]["readings"].extend(day_data["readings"])
+                else:
+                    open_data[meter_id] = day_data
+            daily_data = open_data
+            written = open_day[3]
+        elif open_day is not None:
+            self._close_day(open_day)
+
+        if write:
+            write_json_file(self.get_daily_file_path(process_date), daily_data)
+            written = True
+        self._open_day = (process_date, date_str, daily_data, written)
+
+    def _close_day(self, open_day: Tuple[datetime.datetime, str, Dict[str, dict], bool]):
+        """Move a finished day into the month's append-only detail log."""
+        day, _, day_data, written = open_day
+        month_dir = self.directory_manager.get_month_directory(
+            self.directory_manager.daily_readings_dir, day
         )
-        yesterday_monthly_file = os.path.join(
-            yesterday_month_dir, 
-            f"daily_{yesterday.strftime('%Y%m')}_detail.json"
+        append_monthly_detail(
+            os.path.join(month_dir, f"daily_{day.year:04d}{day.month:02d}_detail.jsonl"), day_data
         )
+        if written:
+            try:
+                os.remove(self.get_daily_file_path(day))
+            except FileNotFoundError:
+                pass
 
-        monthly_data = {}
-        if os.path.exists(yesterday_monthly_file):
-            with open(yesterday_monthly_file, "r", encoding="utf-8") as f:
-                try:
-                    monthly_data = json.load(f)
-                except json.JSONDecodeError:
-                    monthly_data = {}
+    def _recover_open_day(self, process_date: datetime.datetime, date_str: str):
+        """
+        Rebuild the open day from disk when none is held in memory (e.g. after a
+        restart): yesterday's file is moved into the detail log and today's file,
+        if any, becomes the open day so new readings are appended to it.
+        Returns (open day or None, yesterday's data or None).
+        """
+        yesterday = process_date - datetime.timedelta(days=1)
+        yesterday_data = self._read_day_file(yesterday)
+        if yesterday_data is not None:
+            self._close_day((yesterday, None, yesterday_data, True))
 
-        if os.path.exists(yesterday_file):
-            with open(yesterday_file, "r", encoding="utf-8") as f:
-                try:
-                    yesterday_data = json.load(f)
-                    for meter_id, meter_data in yesterday_data.items():
-                        if meter_id not in monthly_data:
-                            monthly_data[meter_id] = []
-                        monthly_data[meter_id].append(meter_data)
-                    os.remove(yesterday_file)
-                except json.JSONDecodeError:
-                    pass
+        today_data = self._read_day_file(process_date)
+        if today_data is None:
+            return None, yesterday_data
+        return (process_date, date_str, today_data, True), yesterday_data
 
-        os.makedirs(os.path.dirname(yesterday_monthly_file), exist_ok=True)
-        with open(yesterday_monthly_file, "w", encoding="utf-8") as f:
-            json.dump(monthly_data, f, ensure_ascii=False, indent=2)
+    def _read_day_file(self, date: datetime.datetime) -> Optional[Dict[str, dict]]:
+        """
+        Read a day's file, or None if there is none. A file that cannot be parsed
+        is renamed to .corrupt and reported, so it is kept for inspection without
+        failing every later collect.
+        """
+        path = self.get_daily_file_path(date)
+        try:
+            return read_json_file(path)
+        except FileNotFoundError:
+            return None
+        except ValueError as e:
+            os.replace(path, path + ".corrupt")
+            print(f"Unreadable daily file moved to {path}.corrupt: {str(e)}")
+            return None
+
+    def resume(self, current_time: datetime.datetime) -> Dict[str, float]:
+        """
+        Make sure the open day for current_time is loaded (recovering it from disk
+        after a restart) and return each meter's last recorded value, so readings
+        generated next continue from those values instead of starting again at 0.
+        A clock at 00:00 (the usual state after days/months collects) has no file
+        for today yet; the values then come from yesterday's file as it is closed.
+        """
+        last_values = {}
+        if self._open_day is None:
+            self._open_day, closed_data = self._recover_open_day(
+                current_time, current_time.strftime("%Y-%m-%d")
+            )
+            if closed_data is not None:
+                last_values.update(self._last_values(closed_data))
+        if self._open_day is not None:
+            last_values.update(self._last_values(self._open_day[2]))
+        return last_values
+
+    @staticmethod
+    def _last_values(day_data: Dict[str, dict]) -> Dict[str, float]:
+        return {
+            meter_id: meter_day["readings"][-1]["value"]
+            for meter_id, meter_day in day_data.items()
+            if meter_day["readings"]
+        }
 
-        daily_file = self.get_daily_file_path(process_date)
-        os.makedirs(os.path.dirname(daily_file), exist_ok=True)
-        with open(daily_file, "w", encoding="utf-8") as f:
-            json.dump(daily_data, f, ensure_ascii=False, indent=2)
+    def reset(self):
+        self._open_day = None
 
     def get_daily_file_path(self, date: datetime.datetime) -> str:
         month_dir = self.directory_manager.get_month_directory(
             self.directory_manager.daily_readings_dir, date
         )
-        return os.path.join(month_dir, f"readings_{date.strftime('%Y%m%d')}.json")
+        return os.path.join(month_dir, f"readings_{date.year:04d}{date.month:02d}{date.day:02d}.json")
     
-    def process_all(self, daily_cache: List[MeterReading]):
-        if not daily_cache:
-            return
-        
-        readings_by_date = {}
-        for reading in daily_cache:
-            date_str = datetime.datetime.fromisoformat(reading.reading_time).strftime("%Y-%m-%d")
-            if date_str not in readings_by_date:
-                readings_by_date[date_str] = []
-            readings_by_date[date_str].append(reading)
-        
-        for date_str, readings in readings_by_date.items():
-            process_date = datetime.datetime.fromisoformat(readings[-1].reading_time)
-            self.process(readings, process_date)
+    def process_all(self, daily_cache: Dict[str, dict]):
+        # The cache is already bucketed by day in chronological order; reuse the bucket key.
+        # Only the last day is written as a daily file, earlier days go straight to the log.
+        days = [(date_str, readings) for date_str, readings in daily_cache.items() if readings["meter_id"]]
+        for i, (date_str, readings) in enumerate(days):
+            self.process(readings, readings["last_dt"], date_str, write=i == len(days) - 1)
 
 # ==========================
 # Monthly Processor: Archives monthly data, generates monthly consumption and cleans old data
@@ -313,7 +649,7 @@ class MonthlyProcessor:
 
     def archive(self, current_date: datetime.datetime):
         """
-        Archive monthly data by processing daily_YYYYMM_detail.json from previous month
+        Archive monthly data by processing daily_YYYYMM_detail.jsonl from previous month
         Store monthly summary in year directories under month_readings
         """
         # Calculate dates
@@ -325,6 +661,11 @@ class MonthlyProcessor:
         if last_month_first < datetime.datetime(2024, 5, 1):
             return
 
+        # Format the archived month once: "YYYYMM" for file names, "YYYY" and "YYYY-MM" derived from it
+        last_month_ym = last_month_first.strftime("%Y%m")
+        last_month_year = last_month_ym[:4]
+        month_key = f"{last_month_year}-{last_month_ym[4:]}"
+
         # Get paths
         last_month_dir = self.directory_manager.get_month_directory(
             self.directory_manager.daily_readings_dir,
@@ -332,76 +673,61 @@ class MonthlyProcessor:
         )
         last_month_detail_file = os.path.join(
             last_month_dir,
-            f"daily_{last_month_first.strftime('%Y%m')}_detail.json"
+            f"daily_{last_month_ym}_detail.jsonl"
         )
         
         # Create year directory in month_readings
         year_dir = os.path.join(
             self.directory_manager.monthly_readings_dir,
-            last_month_first.strftime("%Y")
+            last_month_year
         )
         os.makedirs(year_dir, exist_ok=True)
         
         # Monthly summary file path now includes year directory
         monthly_summary_file = os.path.join(
             year_dir,
-            f"month_readings_{last_month_first.strftime('%Y%m')}.json"
+            f"month_readings_{last_month_ym}.json"
         )
 
         # Read and process daily detail file
-        if os.path.exists(last_month_detail_file):
-            try:
-                with open(last_month_detail_file, "r", encoding="utf-8") as f:
-                    detail_data = json.load(f)
-                
-                monthly_data = {}
-
-                # Process each meter's data
-                for meter_id, daily_readings in detail_data.items():
-                    # Sort all readings by date for this meter
-                    all_readings = []
-                    for day_data in daily_readings:
-                        date = day_data["date"]
-                        for reading in day_data["readings"]:
-                            all_readings.append({
-                                "datetime": f"{date} {reading['time']}",
-                                "date": date,
-                                "time": reading["time"],
-                                "value": reading["value"]
-                            })
-                    
-                    if all_readings:
-                        # Sort readings by datetime
-                        all_readings.sort(key=lambda x: x["datetime"])
-                        
-                        # Keep only first and last readings
-                        month_key = last_month_first.strftime("%Y-%m")
-                        if meter_id not in monthly_data:
-                            monthly_data[meter_id] = {}
-                        
-                        # Store first and last readings in the requested format
-                        monthly_data[meter_id][month_key] = {
-                            "readings": [
-                                {
-                                    "date": all_readings[0]["date"],
-                                    "time": all_readings[0]["time"],
-                                    "value": all_readings[0]["value"]
-                                },
-                                {
-                                    "date": all_readings[-1]["date"],
-                                    "time": all_readings[-1]["time"],
-                                    "value": all_readings[-1]["value"]
-                                }
-                            ]
-                        }
-
-                # Save monthly summary
-                os.makedirs(os.path.dirname(monthly_summary_file), exist_ok=True)
-                with open(monthly_summary_file, "w", encoding="utf-8") as f:
-                    json.dump(monthly_data, f, ensure_ascii=False, indent=2)
-
-            except Exception as e:
-                print(f"Error processing monthly archive: {str(e)}")
+        try:
+            # Stream the detail log, tracking each meter's earliest and latest reading.
+            # Readings within a day are stored in time order, so only each day's
+            # endpoints need comparing; ties keep the first/last occurrence
+            bounds = {}
+            for meter_id, day_data in iter_monthly_detail(last_month_detail_file):
+                readings = day_data["readings"]
+                if not readings:
+                    continue
+                bound = bounds.setdefault(meter_id, [None, None])
+                date = day_data["date"]
+                head_key = (date, readings[0]["time"])
+                if bound[0] is None or head_key < bound[0][0]:
+                    bound[0] = (head_key, readings[0]["value"])
+                tail_key = (date, readings[-1]["time"])
+                if bound[1] is None or tail_key >= bound[1][0]:
+                    bound[1] = (tail_key, readings[-1]["value"])
+
+            # Store first and last readings in the requested format
+            monthly_data = {}
+            for meter_id, (first, last) in bounds.items():
+                monthly_data[meter_id] = {
+                    month_key: {
+                        "readings": [
+                            {"date": first[0][0], "time": first[0][1], "value": first[1]},
+                            {"date": last[0][0], "time": last[0][1], "value": last[1]}
+                        ]
+                    }
+                }
+
+            # Save monthly summary
+            write_json_file(monthly_summary_file, monthly_data)
+
+        except FileNotFoundError:
+            # No detail log for last month: nothing to archive
+            pass
+        except Exception as e:
+            print(f"Error processing monthly archive: {str(e)}")
 
         # Clean up old readings
         self._cleanup_old_readings(first_of_current)
@@ -422,9 +748,12 @@ class MonthlyProcessor:
         folder_path = os.path.join(self.directory_manager.daily_readings_dir, folder_to_delete)
         
         # Delete if exists
-        if os.path.exists(folder_path):
+        try:
             shutil.rmtree(folder_path)
-            print(f"Deleted folder: {folder_to_delete}")  # Debug log
+        except FileNotFoundError:
+            return
+        self.directory_manager.forget_directories()
+        print(f"Deleted folder: {folder_to_delete}")  # Debug log
 
 # ==========================
 # Smart Meter System: Facade class combining all modules
@@ -438,45 +767,65 @@ class SmartMeterSystem:
         self.reading_generator = ReadingGenerator(self.time_manager, self.account_manager)
         self.daily_processor = DailyProcessor(self.directory_manager)
         self.monthly_processor = MonthlyProcessor(self.directory_manager)
+        # Serializes register/collect/reset under a threaded server. Queries do not
+        # take it: they skip a detail log line still being appended and fall back
+        # to the log when a day file is removed after its folder was listed
+        self._write_lock = threading.RLock()
 
     def register_meter(self, meter_id: str, area: str, dwelling: str) -> dict:
-        current_time = self.time_manager.get_current_time()
-        formatted_time = current_time.strftime("%Y-%m-%dT%H:%M:%S")
-        account = self.account_manager.register_account(meter_id, area, dwelling, formatted_time)
-        # Initialize meter reading
-        self.reading_generator.latest_readings[meter_id] = 0
-        self.reading_generator.daily_cache.append(MeterReading(meter_id, formatted_time, 0))
-        return account
+        with self._write_lock:
+            current_time = self.time_manager.get_current_time()
+            formatted_time = current_time.strftime("%Y-%m-%dT%H:%M:%S")
+            account = self.account_manager.register_account(meter_id, area, dwelling, formatted_time)
+            # Initialize meter reading
+            self.reading_generator.latest_readings[meter_id] = 0
+            daily_cache = self.reading_generator.day_bucket(current_time.strftime("%Y-%m-%d"))
+            daily_cache["meter_id"].append(meter_id)
+            daily_cache["last_dt"] = current_time
+            daily_cache["time_str"].append(current_time.strftime("%H:%M"))
+            daily_cache["value"].append(0)
+            return account
 
     def collect_readings(self, increment_unit: str = 'days', increment_value: int = 1) -> dict:
-        # Record current time before collection
-        old_time = self.time_manager.get_current_time()
-        result = self.reading_generator.collect(increment_unit, increment_value)
-        # Archive daily_cache data by date
-        self.daily_processor.process_all(self.reading_generator.daily_cache)
-        # Clear cache
-        self.reading_generator.daily_cache.clear()
-        new_time = datetime.datetime.fromisoformat(result["new_time"])
-        # If month changes during collection, trigger archiving (archive data from two months ago)
-        if old_time.month != new_time.month:
-            self.monthly_processor.archive(new_time)
-        return result
+        with self._write_lock:
+            # Record current time before collection
+            old_time = self.time_manager.get_current_time()
+            # After a restart latest_readings is empty; continue from the recovered open day
+            for meter_id, value in self.daily_processor.resume(old_time).items():
+                self.reading_generator.latest_readings.setdefault(meter_id, round(value * 1000))
+            result = self.reading_generator.collect(increment_unit, increment_value)
+            # Archive each day's cached bucket
+            self.daily_processor.process_all(self.reading_generator.daily_cache)
+            # Clear cache
+            self.reading_generator.daily_cache = {}
+            new_time = datetime.datetime.fromisoformat(result["new_time"])
+            # If month changes during collection, trigger archiving (archive data from two months ago)
+            if old_time.month != new_time.month:
+                self.monthly_processor.archive(new_time)
+            return result
 
     def reset_system(self) -> bool:
+        with self._write_lock:
+            return self._reset_system()
+
+    def _reset_system(self) -> bool:
         try:
             # Clear daily_readings and monthly_readings directories
             for directory in [self.directory_manager.daily_readings_dir, self.directory_manager.monthly_readings_dir]:
-                if os.path.exists(directory):
+                try:
                     shutil.rmtree(directory)
+                except FileNotFoundError:
+                    pass
                 os.makedirs(directory)
+            self.directory_manager.forget_directories()
             # Reset account file
-            with open(self.directory_manager.accounts_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+            self.account_manager.save_accounts([])
             # Reset time
             self.time_manager.save_current_time(datetime.datetime(2024, 5, 1))
             # Clear cache
             self.reading_generator.latest_readings.clear()
-            self.reading_generator.daily_cache.clear()
+            self.reading_generator.daily_cache = {}
+            self.daily_processor.reset()
             return True
         except Exception as e:
             import traceback
@@ -487,12 +836,32 @@ class SmartMeterSystem:
 # ==========================
 # Flask Application
 # ==========================
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider for jsonify/request.get_json backed by orjson, keeping sorted keys."""
+
+    def dumps(self, obj, **kwargs) -> str:
+        option = (orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+                  | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATETIME)
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__, 
     template_folder='templates',  # Specify the templates directory
     static_folder='static'         # Specify the static files directory
 )
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 meter_system = SmartMeterSystem(os.path.dirname(os.path.abspath(__file__)))
-DATA_DIR = "data/daily_readings"
+# Route-side data roots, the same directories the collect side writes to, so
+# queries do not depend on the working directory; paths below them are built
+# with f-strings in the query loops
+DATA_DIR = meter_system.directory_manager.daily_readings_dir
+MONTH_DATA_DIR = meter_system.directory_manager.monthly_readings_dir
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 
 @app.route("/")
@@ -563,15 +932,17 @@ def meter_reading():
 
 @app.route("/api/areas", methods=["GET"])
 def get_areas():
-    """Get area data from a JSON file."""
-    area_data_file = os.path.join(app.static_folder, 'js', 'area_data.json')
+    """
+    Serve the static area data file as-is, without parsing it. Browsers may
+    cache it for a day and revalidate with the ETag send_from_directory sets.
+    """
     try:
-        with open(area_data_file, 'r', encoding='utf-8') as f:
-            return jsonify(json.load(f))
-    except FileNotFoundError:
+        return send_from_directory(
+            os.path.join(app.static_folder, 'js'), 'area_data.json',
+            mimetype='application/json', max_age=86400
+        )
+    except NotFound:
         return jsonify({"error": "Area data file not found"}), 404
-    except json.JSONDecodeError:
-        return jsonify({"error": "Invalid area data format"}), 500
 
 @app.route("/query")
 def query_page():
@@ -597,47 +968,30 @@ def validate_meter():
         return jsonify({"error": str(e)}), 500
 
 def read_current_time():
-    """Read current time from JSON file"""
-    with open("data/current_time.json", 'r') as f:
-        time_data = json.load(f)
-        current_date = datetime.datetime.fromisoformat(time_data["current_time"])
-        return current_date
+    """
+    Read current simulation time through the TimeManager's mtime-checked cache,
+    memoized on flask.g so a request sees one consistent time
+    """
+    current_date = g.get("current_time")
+    if current_date is None:
+        current_date = g.current_time = meter_system.time_manager.get_current_time()
+    return current_date
 
 def check_meter_exists(meter_id):
-    try:
-        current_date = read_current_time()
-        
-        for i in range(7):
-            check_date = current_date - datetime.timedelta(days=i)
-            month_folder = check_date.strftime("%Y%m")
-            file_path = os.path.join(DATA_DIR, month_folder, f"readings_{check_date.strftime('%Y%m%d')}.json")
-            print(f"Checking file: {file_path}") 
-            
-            if os.path.exists(file_path):
-                with open(file_path, 'r') as f:
-                    data = json.load(f)
-                    if meter_id in data:
-                        return True
-        
-        month_folder = current_date.strftime("%Y%m")
-        folder_path = os.path.join(DATA_DIR, month_folder)
-        
-        if os.path.exists(folder_path):
-            for filename in os.listdir(folder_path):
-                if filename.endswith('.json'):
-                    file_path = os.path.join(folder_path, filename)
-                    print(f"Checking monthly file: {file_path}") 
-                    
-                    with open(file_path, 'r') as f:
-                        data = json.load(f)
-                        if meter_id in data:
-                            return True
-        
-        return False
-        
-    except Exception as e:
-        print(f"Error checking meter existence: {str(e)}") 
-        return False
+    """Check the meter ID against the registered accounts held in memory."""
+    return meter_system.account_manager.has_account(meter_id)
+
+def list_file_names(directory: str, listings: Dict[str, set]) -> set:
+    """Return the entry names in directory (empty if missing), memoized in listings."""
+    names = listings.get(directory)
+    if names is None:
+        try:
+            with os.scandir(directory) as entries:
+                names = {entry.name for entry in entries}
+        except FileNotFoundError:
+            names = set()
+        listings[directory] = names
+    return names
 
 @app.route("/query_usage")
 def query_usage():
@@ -655,23 +1009,24 @@ def query_usage():
         
         if time_range == "today":
             # Get today's readings with 30-minute intervals
-            date_str = current_date.strftime("%Y%m%d")
-            month_folder = current_date.strftime("%Y%m")
-            file_path = os.path.join("data/daily_readings", month_folder, f"readings_{date_str}.json")
+            month_folder = f"{current_date.year:04d}{current_date.month:02d}"
+            date_str = f"{month_folder}{current_date.day:02d}"
+            file_path = f"{DATA_DIR}/{month_folder}/readings_{date_str}.json"
             
-            if os.path.exists(file_path):
-                with open(file_path, 'r') as f:
-                    data = json.load(f)
-                    if meter_id in data:
-                        readings = data[meter_id]["readings"]
-                        prev_value = None
-                        for reading in readings:
-                            time = reading["time"]
-                            current_value = reading["value"]
-                            if prev_value is not None:
-                                dates.append(time)
-                                usage.append(round(current_value - prev_value, 3))
-                            prev_value = current_value
+            try:
+                data = read_json_cached(file_path)
+            except FileNotFoundError:
+                data = {}
+            if meter_id in data:
+                readings = data[meter_id]["readings"]
+                prev_value = None
+                for reading in readings:
+                    time = reading["time"]
+                    current_value = reading["value"]
+                    if prev_value is not None:
+                        dates.append(time)
+                        usage.append(round(current_value - prev_value, 3))
+                    prev_value = current_value
                             
         elif time_range in ["last_7_days", "this_month", "last_month"]:
             if time_range == "last_7_days":
@@ -685,58 +1040,74 @@ def query_usage():
                 start_date = (first_of_month - datetime.timedelta(days=1)).replace(day=1)
                 end_date = first_of_month - datetime.timedelta(days=1)
             
-            # Process data based on date range
+            # Process data based on date range; each folder is listed and each
+            # monthly detail log or summary parsed at most once
+            listings: Dict[str, set] = {}
+            details: Dict[str, Dict[str, Tuple[float, float, int]]] = {}
+            hist_days: Dict[str, Dict[str, list]] = {}
             current_date = start_date
             while current_date <= end_date:
-                month_folder = current_date.strftime("%Y%m")
-                date_str = current_date.strftime("%Y%m%d")
+                # Plain f-strings are much cheaper than strftime in this per-day loop
+                year, month, day = current_date.year, current_date.month, current_date.day
+                month_folder = f"{year:04d}{month:02d}"
+                date_str = f"{month_folder}{day:02d}"
+                month_key = f"{year:04d}-{month:02d}"
+                day_key = f"{month_key}-{day:02d}"
                 
                 # Check if data is in daily readings
-                daily_path = os.path.join("data/daily_readings", month_folder, f"readings_{date_str}.json")
-                monthly_path = os.path.join("data/daily_readings", month_folder, f"daily_{month_folder}_detail.json")
-                hist_monthly_path = os.path.join("data/month_readings", current_date.strftime("%Y"), f"month_readings_{month_folder}.json")
+                daily_dir = f"{DATA_DIR}/{month_folder}"
+                daily_names = list_file_names(daily_dir, listings)
+                daily_name = f"readings_{date_str}.json"
+                detail_name = f"daily_{month_folder}_detail.jsonl"
+                hist_dir = f"{MONTH_DATA_DIR}/{year:04d}"
+                hist_name = f"month_readings_{month_folder}.json"
                 
                 daily_usage = None
+                daily_data = None
                 
-                if os.path.exists(daily_path):
-                    with open(daily_path, 'r') as f:
-                        data = json.load(f)
-                        if meter_id in data:
-                            readings = data[meter_id]["readings"]
-                            if len(readings) >= 2:
-                                daily_usage = readings[-1]["value"] - readings[0]["value"]
+                if daily_name in daily_names:
+                    try:
+                        daily_data = read_json_cached(f"{daily_dir}/{daily_name}")
+                    except FileNotFoundError:
+                        # A collect moved the day into the detail log after the
+                        # folder was listed; list it again and use the log instead
+                        del listings[daily_dir]
+                        daily_names = list_file_names(daily_dir, listings)
                 
-                elif os.path.exists(monthly_path):
-                    with open(monthly_path, 'r') as f:
-                        data = json.load(f)
-                        if meter_id in data:
-                            for day_data in data[meter_id]:
-                                if day_data["date"] == current_date.strftime("%Y-%m-%d"):
-                                    readings = day_data["readings"]
-                                    if len(readings) >= 2:
-                                        daily_usage = readings[-1]["value"] - readings[0]["value"]
-                                    break
+                if daily_data is not None:
+                    if meter_id in daily_data:
+                        readings = daily_data[meter_id]["readings"]
+                        if len(readings) >= 2:
+                            daily_usage = readings[-1]["value"] - readings[0]["value"]
                 
-                elif os.path.exists(hist_monthly_path):
-                    with open(hist_monthly_path, 'r') as f:
-                        data = json.load(f)
+                elif detail_name in daily_names or detail_name[:-1] in daily_names:
+                    # A missing .jsonl log falls back to the legacy .json snapshot.
+                    # Per-day first/last totals are enough here, looked up by date.
+                    detail_path = f"{daily_dir}/{detail_name}"
+                    meter_days = details.get(detail_path)
+                    if meter_days is None:
+                        meter_days = details[detail_path] = read_daily_totals_cached(detail_path).get(meter_id, {})
+                    day_totals = meter_days.get(day_key)
+                    if day_totals is not None and day_totals[2] >= 2:
+                        daily_usage = day_totals[1] - day_totals[0]
+                
+                elif hist_name in list_file_names(hist_dir, listings):
+                    # Group the meter's readings for the month by date on first use
+                    hist_path = f"{hist_dir}/{hist_name}"
+                    values_by_date = hist_days.get(hist_path)
+                    if values_by_date is None:
+                        values_by_date = hist_days[hist_path] = {}
+                        data = read_json_cached(hist_path)
                         if meter_id in data:
-                            month_key = current_date.strftime("%Y-%m")
                             if month_key in data[meter_id]:
-                                readings = data[meter_id][month_key]["readings"]
-                                start_reading = None
-                                end_reading = None
-                                for reading in readings:
-                                    reading_date = datetime.datetime.strptime(reading["date"], "%Y-%m-%d").date()
-                                    if reading_date == current_date.date():
-                                        if start_reading is None:
-                                            start_reading = reading["value"]
-                                        end_reading = reading["value"]
-                                if start_reading is not None and end_reading is not None:
-                                    daily_usage = end_reading - start_reading
+                                for reading in data[meter_id][month_key]["readings"]:
+                                    values_by_date.setdefault(reading["date"], []).append(reading["value"])
+                    day_values = values_by_date.get(day_key)
+                    if day_values:
+                        daily_usage = day_values[-1] - day_values[0]
                 
                 if daily_usage is not None:
-                    dates.append(current_date.strftime("%Y-%m-%d"))
+                    dates.append(day_key)
                     usage.append(round(daily_usage, 3))
                 
                 current_date += datetime.timedelta(days=1)
@@ -759,58 +1130,50 @@ def monthly_history():
             return jsonify({"error": "Meter ID is required"}), 400
             
         current_date = read_current_time()
-        months = []
-        usage = []
-        days = []
+        # (month_key, usage, days with readings) per month found
+        records = []
         
-        # Start from the current month and go back in time
+        # Step back one calendar month at a time; each folder is listed at most once
+        listings: Dict[str, set] = {}
+        month_index = current_date.year * 12 + current_date.month - 1
         for i in range(12):  # Show up to 12 months of history
-            check_date = current_date - datetime.timedelta(days=30*i)
-            month_folder = check_date.strftime("%Y%m")
-            year_folder = check_date.strftime("%Y")
+            year, month = divmod(month_index - i, 12)
+            month += 1
+            month_folder = f"{year:04d}{month:02d}"
+            month_key = f"{year:04d}-{month:02d}"
             
             # Try to find data in monthly readings first
-            monthly_file = os.path.join("data/month_readings", year_folder, f"month_readings_{month_folder}.json")
-            if os.path.exists(monthly_file):
-                with open(monthly_file, 'r') as f:
-                    data = json.load(f)
-                    if meter_id in data:
-                        month_key = check_date.strftime("%Y-%m")
-                        if month_key in data[meter_id]:
-                            readings = data[meter_id][month_key]["readings"]
-                            if len(readings) >= 2:
-                                month_usage = readings[-1]["value"] - readings[0]["value"]
-                                months.append(month_key)
-                                usage.append(round(month_usage, 3))
-                                days.append(len(set(r["date"] for r in readings)))
+            year_dir = f"{MONTH_DATA_DIR}/{year:04d}"
+            monthly_name = f"month_readings_{month_folder}.json"
+            if monthly_name in list_file_names(year_dir, listings):
+                data = read_json_cached(f"{year_dir}/{monthly_name}")
+                if meter_id in data:
+                    if month_key in data[meter_id]:
+                        readings = data[meter_id][month_key]["readings"]
+                        if len(readings) >= 2:
+                            month_usage = readings[-1]["value"] - readings[0]["value"]
+                            records.append((month_key, round(month_usage, 3), len(set(r["date"] for r in readings))))
             
             # If not found in monthly readings, check daily readings
             else:
-                monthly_detail = os.path.join("data/daily_readings", month_folder, f"daily_{month_folder}_detail.json")
-                if os.path.exists(monthly_detail):
-                    with open(monthly_detail, 'r') as f:
-                        data = json.load(f)
-                        if meter_id in data:
-                            first_day = data[meter_id][0]["readings"][0]["value"]
-                            last_day = data[meter_id][-1]["readings"][-1]["value"]
-                            month_usage = last_day - first_day
-                            months.append(check_date.strftime("%Y-%m"))
-                            usage.append(round(month_usage, 3))
-                            days.append(len(data[meter_id]))
+                daily_dir = f"{DATA_DIR}/{month_folder}"
+                daily_names = list_file_names(daily_dir, listings)
+                detail_name = f"daily_{month_folder}_detail.jsonl"
+                if detail_name in daily_names or detail_name[:-1] in daily_names:
+                    # A missing .jsonl log falls back to the legacy .json snapshot
+                    totals = read_daily_totals_cached(f"{daily_dir}/{detail_name}")
+                    if meter_id in totals:
+                        meter_days = list(totals[meter_id].values())
+                        month_usage = meter_days[-1][1] - meter_days[0][0]
+                        records.append((month_key, round(month_usage, 3), len(meter_days)))
         
-        # Sort by date
-        months_sorted = []
-        usage_sorted = []
-        days_sorted = []
-        for m, u, d in sorted(zip(months, usage, days)):
-            months_sorted.append(m)
-            usage_sorted.append(u)
-            days_sorted.append(d)
+        # Sort by date; month keys are unique, so the key alone decides the order
+        records.sort(key=itemgetter(0))
         
         return jsonify({
-            "months": months_sorted,
-            "usage": usage_sorted,
-            "days": days_sorted
+            "months": [record[0] for record in records],
+            "usage": [record[1] for record in records],
+            "days": [record[2] for record in records]
         })
         
     except Exception as e:
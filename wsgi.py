@@ -0,0 +1,12 @@
+"""
+WSGI entry point for running the app under a production server, e.g.
+
+    gunicorn -w 1 --threads 8 -k gthread wsgi:application
+
+Keep a single worker process: the latest readings and the daily cache live in
+memory, so separate workers would each simulate their own meters. Threads share
+that process; collects, registrations and resets take SmartMeterSystem's lock,
+while queries run without it and tolerate a collect changing files under them.
+`python app.py` still starts the Werkzeug development server.
+"""
+from app import app as application